@@ -1,10 +1,9 @@
 import os
 import boto3
+import copy
 import logging
 import json
 import re
-import sys
-import subprocess
 from bs4 import BeautifulSoup, Comment
 import requests
 from botocore.exceptions import ClientError, NoCredentialsError
@@ -12,10 +11,20 @@ from django.conf import settings
 from apps.categorized_tags.models import CategorizedTag
 from urllib.parse import urlparse
 from django.utils import timezone
-from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Patterns used on every scraped page, compiled once at import
+BR_TAG_RE = re.compile(r'<br\s*/?>', re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
+INTER_TAG_WHITESPACE_RE = re.compile(r'>\s+<')
+EXCESS_NEWLINES_RE = re.compile(r'\n{3,}')
+PARAGRAPH_TAG_RE = re.compile(r'</?p>')
+BR_SPLIT_RE = re.compile(r'<br\s*/?>')
+
+# Upper bound on the size of a page fetched for processing
+MAX_HTML_BYTES = 20 * 1024 * 1024
+
 def preprocess_html(html_content, css_selectors=None):
     """Preprocess HTML to reduce payload size for AWS Bedrock.
     
@@ -64,15 +73,20 @@ def preprocess_html(html_content, css_selectors=None):
         # Get the HTML as string
         processed_html = str(body)
         
-        # First, protect <br> and <br/> tags by replacing them with a unique placeholder
-        processed_html = re.sub(r'<br\s*/?>', '{{BR_TAG}}', processed_html, flags=re.IGNORECASE)
+        # First, protect <br> and <br/> tags by replacing them with a unique placeholder.
+        # BeautifulSoup serializes tag names in lowercase, so a plain substring
+        # check is enough to skip the regex on pages without any <br>.
+        has_br = '<br' in processed_html
+        if has_br:
+            processed_html = BR_TAG_RE.sub('{{BR_TAG}}', processed_html)
         
         # Remove excess whitespace
-        processed_html = re.sub(r'\s+', ' ', processed_html)
-        processed_html = re.sub(r'>\s+<', '><', processed_html)
+        processed_html = WHITESPACE_RE.sub(' ', processed_html)
+        processed_html = INTER_TAG_WHITESPACE_RE.sub('><', processed_html)
         
         # Restore the <br> tags
-        processed_html = processed_html.replace('{{BR_TAG}}', '<br>')
+        if has_br:
+            processed_html = processed_html.replace('{{BR_TAG}}', '<br>')
         
         logger.info(f"HTML preprocessing reduced size from {len(html_content)} to {len(processed_html)} bytes")
         return processed_html
@@ -127,14 +141,16 @@ def extract_elements_by_css_selectors(html_content, css_selectors):
                     
                     # Log a sample of each matched element
                     for i, element in enumerate(matches):
-                        # Store a deep copy of the element to avoid modifying the original
-                        # Deep copy ensures we get the entire subtree
-                        element_copy = str(element)  # Convert to string to ensure we get a complete copy
-                        all_matching_elements.append((selector, element_copy, i))
+                        # Store a copy of the element to avoid modifying the original.
+                        # Copying a Tag copies its entire subtree, so there is no need
+                        # to serialize it and parse it back later.
+                        all_matching_elements.append((selector, copy.copy(element), i))
                         
-                        # Log a preview
-                        element_preview = element_copy[:100] + "..." if len(element_copy) > 100 else element_copy
-                        logger.info(f"Match {i+1} for '{selector}': {element_preview}")
+                        # Log a preview, skipping serialization when INFO is filtered out
+                        if logger.isEnabledFor(logging.INFO):
+                            element_html = str(element)
+                            element_preview = element_html[:100] + "..." if len(element_html) > 100 else element_html
+                            logger.info("Match %d for '%s': %s", i + 1, selector, element_preview)
                 else:
                     logger.warning(f"No elements found matching selector '{selector}'")
                     # Try to find elements that might be similar for debugging
@@ -165,11 +181,7 @@ def extract_elements_by_css_selectors(html_content, css_selectors):
             
         # Now add all collected elements to the new soup
         logger.info(f"Adding {len(all_matching_elements)} matched elements to new document")
-        for selector, element_str, idx in all_matching_elements:
-            # Parse the string back to a soup element
-            element_soup = BeautifulSoup(element_str, 'html.parser')
-            # Get the root element
-            element = next(element_soup.children)
+        for selector, element, idx in all_matching_elements:
             # Add to the new body
             new_soup.body.append(element)
             
@@ -214,6 +226,46 @@ def get_tag_categories():
         logger.error(f"Error fetching tag categories: {str(e)}")
         return []
 
+def fetch_html(url, headers=None, timeout=30):
+    """Fetch a page's HTML, checking the headers before downloading the body.
+    
+    Args:
+        url (str): The URL to fetch
+        headers (dict, optional): Request headers
+        timeout (int): Request timeout in seconds
+        
+    Returns:
+        str: The decoded HTML content
+        
+    Raises:
+        requests.RequestException: If the request fails or returns 4XX/5XX
+        ValueError: If the response is not HTML or exceeds MAX_HTML_BYTES
+    """
+    with requests.get(url, headers=headers, timeout=timeout, stream=True) as response:
+        response.raise_for_status()  # Raise exception for 4XX/5XX responses
+        
+        # Check if content is HTML
+        content_type = response.headers.get('Content-Type', '').lower()
+        if 'text/html' not in content_type:
+            raise ValueError(f"URL does not contain HTML content. Content-Type: {content_type}")
+        
+        content_length = response.headers.get('Content-Length', '')
+        if content_length.isdigit() and int(content_length) > MAX_HTML_BYTES:
+            raise ValueError(f"URL content is too large: {content_length} bytes (limit {MAX_HTML_BYTES})")
+        
+        # Read the body in chunks so a missing or wrong Content-Length can't exceed the cap
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            body.extend(chunk)
+            if len(body) > MAX_HTML_BYTES:
+                raise ValueError(f"URL content exceeds {MAX_HTML_BYTES} bytes")
+        
+        # Decode the same way response.text does, including for unknown charsets
+        try:
+            return body.decode(response.encoding or 'utf-8', errors='replace')
+        except LookupError:
+            return str(body, errors='replace')
+
 def validate_url(url):
     """Validate that a URL is accessible and returns valid HTML.
     
@@ -297,7 +349,7 @@ def process_element_with_spacing(element, keep_newlines=True):
                 text = child.get_text(separator='\n', strip=True)
             else:
                 text = child.get_text(separator=' ', strip=True)
-                text = re.sub(r'\s+', ' ', text)  # Clean up whitespace
+                text = WHITESPACE_RE.sub(' ', text)  # Clean up whitespace
             
             if text.strip():  # Only add non-empty text
                 direct_children.append(text)
@@ -313,7 +365,7 @@ def process_element_with_spacing(element, keep_newlines=True):
         return element.get_text(separator='\n', strip=True)
     else:
         text = element.get_text(separator=' ', strip=True)
-        return re.sub(r'\s+', ' ', text)
+        return WHITESPACE_RE.sub(' ', text)
 
 def extract_content_with_selectors(url, selectors_config, keep_newlines=True, add_extra_spacing=True):
     """
@@ -338,12 +390,11 @@ def extract_content_with_selectors(url, selectors_config, keep_newlines=True, ad
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         logger.info(f"Fetching {url}...")
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
+        html_content = fetch_html(url, headers=headers, timeout=15)
         
         # Parse the HTML content
         logger.info("Parsing HTML...")
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(html_content, 'html.parser')
         
         # Extract text from each CSS selector
         all_sections = []
@@ -395,10 +446,10 @@ def extract_content_with_selectors(url, selectors_config, keep_newlines=True, ad
                         # Replace multiple newlines with single newline for cleaner output
                         text = element.get_text(separator='\n', strip=True)
                         # But ensure paragraphs stay separated
-                        text = re.sub(r'\n{3,}', '\n\n', text)
+                        text = EXCESS_NEWLINES_RE.sub('\n\n', text)
                     else:
                         text = element.get_text(separator=' ', strip=True)
-                        text = re.sub(r'\s+', ' ', text)
+                        text = WHITESPACE_RE.sub(' ', text)
                     
                     if text:
                         # Add element index if there are multiple elements
@@ -541,16 +592,7 @@ def process_url_content(url, css_selectors=None):
         }
         
         # Fetch content
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()  # Raise exception for 4XX/5XX responses
-        
-        # Check if content is HTML
-        content_type = response.headers.get('Content-Type', '').lower()
-        if 'text/html' not in content_type:
-            raise ValueError(f"URL does not contain HTML content. Content-Type: {content_type}")
-        
-        # Get HTML content
-        html_content = response.text
+        html_content = fetch_html(url, headers=headers, timeout=30)
         
         # Log the original content for debugging (first 200 chars)
         logger.info(f"Original HTML content snippet: {html_content[:200]}...")
@@ -922,8 +964,6 @@ def fix_rich_text_html(content):
     Returns:
         str: The fixed HTML content
     """
-    import re
-    
     # Don't process empty content
     if not content:
         return content
@@ -940,19 +980,13 @@ def fix_rich_text_html(content):
     # If we have <br> tags, split by them and create separate paragraphs instead
     if br_count > 0:
         # First remove any existing paragraph tags
-        content = re.sub(r'</?p>', '', content)
+        content = PARAGRAPH_TAG_RE.sub('', content)
         
         # Split by any form of <br> tag
-        parts = re.split(r'<br\s*/?>|<br>', content)
+        parts = BR_SPLIT_RE.split(content)
         
         # Create proper paragraphs
-        fixed_content = ''
-        for part in parts:
-            part = part.strip()
-            if part:
-                fixed_content += f'<p>{part}</p>'
-        
-        content = fixed_content
+        content = ''.join(f'<p>{part}</p>' for part in map(str.strip, parts) if part)
         logger.info("Replaced <br> tags with separate paragraphs")
     
     # Case 1: Content with unbalanced <p> tags
@@ -963,16 +997,10 @@ def fix_rich_text_html(content):
         content = content.replace('</p>', '')
         
         # Split by <p> tags
-        parts = re.split(r'<p>', content)
+        parts = content.split('<p>')
         
         # Create proper paragraphs
-        fixed_content = ''
-        for part in parts:
-            part = part.strip()
-            if part:
-                fixed_content += f'<p>{part}</p>'
-        
-        content = fixed_content
+        content = ''.join(f'<p>{part}</p>' for part in map(str.strip, parts) if part)
         logger.info("Fixed unbalanced <p> tags by restructuring content")
     
     # Case 2: Make sure content starts with <p> if it has any content
@@ -985,36 +1013,39 @@ def fix_rich_text_html(content):
             # Has some <p> tags but doesn't start with one
             # Split by paragraph tags and re-wrap each part
             parts = []
-            current = ''
             in_p = False
             
-            # Simple parser to extract content inside and outside <p> tags
-            for char in content:
-                if content[current:current+3] == '<p>':
-                    if current:
-                        parts.append(('text', current))
-                    current = ''
+            # Simple parser to extract content inside and outside <p> tags,
+            # jumping from tag to tag and slicing the text between them
+            i = 0
+            while True:
+                open_pos = content.find('<p>', i)
+                close_pos = content.find('</p>', i)
+                if open_pos == -1 and close_pos == -1:
+                    break
+                if close_pos == -1 or (open_pos != -1 and open_pos < close_pos):
+                    if open_pos > i:
+                        parts.append(('text', content[i:open_pos]))
                     in_p = True
-                elif content[current:current+4] == '</p>':
-                    if current:
-                        parts.append(('p', current))
-                    current = ''
-                    in_p = False
+                    i = open_pos + 3
                 else:
-                    current += char
+                    if close_pos > i:
+                        parts.append(('p', content[i:close_pos]))
+                    in_p = False
+                    i = close_pos + 4
             
-            if current:
-                parts.append(('text' if not in_p else 'p', current))
+            if i < len(content):
+                parts.append(('text' if not in_p else 'p', content[i:]))
             
             # Rebuild with proper structure
-            fixed_content = ''
+            paragraphs = []
             for part_type, part in parts:
                 if part_type == 'text' and part.strip():
-                    fixed_content += f'<p>{part.strip()}</p>'
+                    paragraphs.append(f'<p>{part.strip()}</p>')
                 elif part_type == 'p':
-                    fixed_content += f'<p>{part}</p>'
+                    paragraphs.append(f'<p>{part}</p>')
             
-            content = fixed_content
+            content = ''.join(paragraphs)
             logger.info("Restructured mixed content to proper paragraphs")
     
     # Log the fixed numbers of tags
@@ -1103,8 +1134,8 @@ def transform_bedrock_data_to_api_format(response_data, url):
                     api_data['tags'].append(tag)
                 elif isinstance(tag, str) and ':' in tag:
                     # Process string format tags (e.g., "Category: Value")
-                    category, name = [part.strip() for part in tag.split(':', 1)]
-                    api_data['tags'].append({'category': category, 'name': name})
+                    category, _, name = tag.partition(':')
+                    api_data['tags'].append({'category': category.strip(), 'name': name.strip()})
 
         # Process specifications
         if 'specifications' in response_data and response_data['specifications']:
@@ -1,21 +1,27 @@
 import json
 import logging
+import random
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.db import transaction
-from wagtail.models import Page
+from django.utils.text import slugify
+from wagtail.models import Page, Site
 
 from .auth import token_required
 from .models import (
     LabEquipmentPage, EquipmentModel, LabEquipmentPageSpecGroup,
-    Spec, EquipmentFeature, LabEquipmentGalleryImage, EquipmentModelSpecGroup
+    Spec, EquipmentFeature, LabEquipmentGalleryImage, EquipmentModelSpecGroup,
+    MultiProductPage
 )
 from apps.categorized_tags.models import CategorizedTag
 from apps.ai_processing.utils import fix_rich_text_html
 
 logger = logging.getLogger(__name__)
 
+SECONDHAND_SOURCE_TYPES = frozenset({'used', 'refurbished'})
+REVIEW_CONFIDENCE_LEVELS = frozenset({'low', 'medium'})
+
 def process_tags(tags_data):
     """
     Process tag data and return CategorizedTag objects.
@@ -36,11 +42,10 @@ def process_tags(tags_data):
             
             # Additional check - if name contains category, split it
             if ':' in name and not category:
-                parts = name.split(':', 1)
-                if len(parts) == 2:
-                    category = parts[0].strip()
-                    name = parts[1].strip()
-                    logger.info(f"Extracted category from name: '{category}' and '{name}'")
+                category, _, name = name.partition(':')
+                category = category.strip()
+                name = name.strip()
+                logger.info(f"Extracted category from name: '{category}' and '{name}'")
             
             # Check if tag exists (ignoring case)
             existing_tag = CategorizedTag.objects.filter(
@@ -92,11 +97,9 @@ def process_tags(tags_data):
                         else:
                             # Try creating with a modified slug if it might be a slug collision
                             try:
-                                import random
                                 # Generate a unique suffix for the slug
                                 suffix = ''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=5))
                                 # Pre-generate the slug to avoid collision
-                                from django.utils.text import slugify
                                 slug = f"{slugify(f'{category}-{name}')}-{suffix}"
                                 
                                 tag = CategorizedTag.objects.create(
@@ -111,7 +114,8 @@ def process_tags(tags_data):
         elif isinstance(tag_data, str):
             # Legacy string format (for backward compatibility)
             if ':' in tag_data:
-                category, name = [part.strip() for part in tag_data.split(':', 1)]
+                category, _, name = tag_data.partition(':')
+                category, name = category.strip(), name.strip()
                 
                 # Additional check - handle Manufacturer-style tags that might already exist
                 # Check first if there's an existing tag with the full string as name and empty category
@@ -162,11 +166,9 @@ def process_tags(tags_data):
                         else:
                             # Try creating with a modified slug if it might be a slug collision
                             try:
-                                import random
                                 # Generate a unique suffix for the slug
                                 suffix = ''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=5))
                                 # Pre-generate the slug to avoid collision
-                                from django.utils.text import slugify
                                 slug = f"{slugify(f'{category}-{name}')}-{suffix}"
                                 
                                 tag = CategorizedTag.objects.create(
@@ -215,11 +217,9 @@ def process_tags(tags_data):
                         else:
                             # Try creating with a modified slug if it might be a slug collision
                             try:
-                                import random
                                 # Generate a unique suffix for the slug
                                 suffix = ''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=5))
                                 # Pre-generate the slug to avoid collision
-                                from django.utils.text import slugify
                                 slug = f"{slugify(f'General-{name}')}-{suffix}"
                                 
                                 tag = CategorizedTag.objects.create(
@@ -259,10 +259,15 @@ def create_or_update_lab_equipment(request):
         existing_page = None
         
         if slug:
-            try:
-                existing_page = LabEquipmentPage.objects.get(slug=slug)
-            except LabEquipmentPage.DoesNotExist:
-                pass
+            matching_pages = list(LabEquipmentPage.objects.filter(slug=slug)[:2])
+            if len(matching_pages) > 1:
+                # Slugs are only unique per parent, so refuse to guess which page to update
+                return JsonResponse({
+                    'success': False,
+                    'error': f'Multiple lab equipment pages match slug "{slug}"'
+                }, status=409)
+            if matching_pages:
+                existing_page = matching_pages[0]
         
         # Process tags separately before entering transaction
         if 'tags' in data and data['tags']:
@@ -404,7 +409,7 @@ def evaluate_data_quality(data):
     quality_metrics['data_completeness'] = sum(completeness_checks)
     
     # Determine specification confidence
-    if quality_metrics['source_type'] in ['used', 'refurbished']:
+    if quality_metrics['source_type'] in SECONDHAND_SOURCE_TYPES:
         # Used equipment listings often have less reliable specs
         spec_count = sum(len(group.get('specs', [])) for group in data.get('specifications', []))
         model_count = len(data.get('models', []))
@@ -422,8 +427,8 @@ def evaluate_data_quality(data):
         
     # Flag for review if completeness is low, confidence is medium/low, or equipment is used/refurbished
     if (quality_metrics['data_completeness'] < 0.7 or 
-        quality_metrics['specification_confidence'] in ['low', 'medium'] or
-        quality_metrics['source_type'] in ['used', 'refurbished']):
+        quality_metrics['specification_confidence'] in REVIEW_CONFIDENCE_LEVELS or
+        quality_metrics['source_type'] in SECONDHAND_SOURCE_TYPES):
         quality_metrics['needs_review'] = True
     
     # Override needs_review if explicitly provided
@@ -438,19 +443,11 @@ def create_lab_equipment_page(data):
     """
     try:
         # Find the parent page - assuming the first MultiProductPage as parent
-        from wagtail.models import Site
-        site = Site.objects.first()
-        root_page = site.root_page
-        
-        # Try to find a MultiProductPage to use as parent
-        from .models import MultiProductPage
-        parent_pages = MultiProductPage.objects.live()
-        
-        if not parent_pages.exists():
+        parent_page = MultiProductPage.objects.live().first()
+
+        if parent_page is None:
             # Fallback to the root page if no MultiProductPage exists
-            parent_page = root_page
-        else:
-            parent_page = parent_pages.first()
+            parent_page = Site.objects.first().root_page
             
         # Evaluate data quality if not already provided
         quality_metrics = evaluate_data_quality(data)
@@ -490,9 +487,8 @@ def create_lab_equipment_page(data):
         # Add categorized tags if provided
         if 'processed_tag_ids' in data and data['processed_tag_ids']:
             # Get tags by pre-processed IDs
-            from apps.categorized_tags.models import CategorizedTag
-            tags = CategorizedTag.objects.filter(id__in=data['processed_tag_ids'])
-            if tags.exists():
+            tags = list(CategorizedTag.objects.filter(id__in=data['processed_tag_ids']))
+            if tags:
                 page.categorized_tags.add(*tags)
                 page.save()
         
@@ -590,22 +586,19 @@ def update_lab_equipment_page(page, data):
         
         # Update categorized tags if provided
         if 'processed_tag_ids' in data and data['processed_tag_ids']:
-            from apps.categorized_tags.models import CategorizedTag
-            
             # Clear existing tags first
             page.categorized_tags.clear()
             
             # Get tags by pre-processed IDs
-            tags = CategorizedTag.objects.filter(id__in=data['processed_tag_ids'])
-            if tags.exists():
+            tags = list(CategorizedTag.objects.filter(id__in=data['processed_tag_ids']))
+            if tags:
                 page.categorized_tags.add(*tags)
                 page.save()
         
         # Clear and re-add specifications
         if 'specifications' in data:
             # Clear existing specs
-            for spec_group in page.spec_groups.all():
-                spec_group.delete()
+            page.spec_groups.all().delete()
             
             # Add new specs
             if data['specifications']:
@@ -614,8 +607,7 @@ def update_lab_equipment_page(page, data):
         # Clear and re-add models
         if 'models' in data:
             # Clear existing models
-            for model in page.models.all():
-                model.delete()
+            page.models.all().delete()
             
             # Add new models
             if data['models']:
@@ -665,16 +657,16 @@ def add_specifications(page, specifications):
             name=group_data['name']
         )
         
-        # Add specs to the group
-        for spec_data in group_data['specs']:
-            if 'key' not in spec_data or 'value' not in spec_data:
-                continue
-                
-            Spec.objects.create(
+        # Add specs to the group in a single INSERT
+        Spec.objects.bulk_create([
+            Spec(
                 spec_group=spec_group,
                 key=spec_data['key'],
                 value=spec_data['value']
             )
+            for spec_data in group_data['specs']
+            if 'key' in spec_data and 'value' in spec_data
+        ])
 
 def add_models(page, models_data):
     """Add equipment models to a page"""
@@ -714,19 +706,19 @@ def add_models(page, models_data):
                     )
                     spec_groups_created += 1
                     
-                    # Add specs to the group
-                    specs_created = 0
+                    # Add specs to the group in a single INSERT
+                    specs = []
                     for spec_data in group_data['specs']:
                         if 'key' not in spec_data or 'value' not in spec_data:
                             logger.warning(f"Skipping spec in group {group_data['name']} - missing key or value")
                             continue
                             
-                        Spec.objects.create(
+                        specs.append(Spec(
                             spec_group=spec_group,
                             key=spec_data['key'],
                             value=spec_data['value']
-                        )
-                        specs_created += 1
+                        ))
+                    specs_created = len(Spec.objects.bulk_create(specs))
                     
                     logger.debug(f"Added {specs_created} specs to group '{group_data['name']}' for model '{model_data['name']}'")
                 
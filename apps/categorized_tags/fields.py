@@ -18,10 +18,10 @@ class CategoryTagField(TagField):
                 result = []
                 for item in items:
                     # Extract category and name from 'Category: Tag Name' format
-                    parts = item.split(':', 1)
-                    if len(parts) == 2:
-                        category = parts[0].strip()
-                        name = parts[1].strip()
+                    category, sep, name = item.partition(':')
+                    if sep:
+                        category = category.strip()
+                        name = name.strip()
                         
                         # Create or get the tag
                         tag, created = CategorizedTag.objects.get_or_create(
@@ -1,6 +1,7 @@
 # myapp/views.py
 
 import subprocess
+from pathlib import Path
 from django.http import HttpResponseRedirect
 from django.urls import reverse
 from wagtail.admin import messages
@@ -25,9 +26,9 @@ def deploy_latest_code(request):
     # In a Docker scenario, this might simply be touching the WSGI file,
     # which can signal some servers to reload. Adjust as needed.
     try:
-        subprocess.run(['touch', 'wsgi.py'], check=True)
+        Path('wsgi.py').touch()
         messages.success(request, "Server restart triggered.")
-    except subprocess.CalledProcessError as e:
+    except OSError as e:
         messages.error(request, "Failed to trigger server restart: {}".format(e))
     
     return HttpResponseRedirect(request.META.get('HTTP_REFERER', reverse('wagtailadmin_home')))
@@ -2,6 +2,7 @@ import requests
 import json
 import logging
 import os
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +24,7 @@ class LabEquipmentAPIClient:
         """
         self.base_url = (base_url or os.getenv('API_BASE_URL', 'http://localhost:8000')).rstrip('/')
         self.api_token = api_token or os.getenv('API_TOKEN')
+        self.lab_equipment_endpoint = f"{self.base_url}/api/lab-equipment/"
         
         if not self.api_token:
             logger.warning("No API token provided. API authentication will fail.")
@@ -31,6 +33,23 @@ class LabEquipmentAPIClient:
             'Content-Type': 'application/json',
             'Authorization': f'Bearer {self.api_token}'
         }
+        
+        # Sessions are kept per thread, since requests.Session isn't documented
+        # as thread-safe and the importers share one client across workers
+        self._local = threading.local()
+    
+    @property
+    def session(self):
+        """
+        The calling thread's session, created on first use so its connection
+        to the API is kept alive across requests
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
     
     def create_or_update_lab_equipment(self, data):
         """
@@ -42,13 +61,12 @@ class LabEquipmentAPIClient:
         Returns:
             dict: Response from the API
         """
-        endpoint = f"{self.base_url}/api/lab-equipment/"
+        endpoint = self.lab_equipment_endpoint
         
         try:
             logger.info(f"Sending request to {endpoint} with data: {json.dumps(data)[:1000]}...")
-            response = requests.post(
+            response = self.session.post(
                 endpoint,
-                headers=self.headers,
                 data=json.dumps(data)
             )
             
@@ -121,10 +121,11 @@ def search(request):
                 if tags_list:
                     available_filters[category.name] = tags_list
     
-    # Get specific pages for the results (with full data)
+    # Get specific pages for the results (with full data). specific() fetches
+    # them in one query per page type rather than one query per page.
     specific_pages = []
     if page_ids:
-        specific_pages = [p.specific for p in base_pages]
+        specific_pages = list(base_pages.specific())
     
     # Pagination
     paginator = Paginator(specific_pages, 12)  # Show 12 products per page
@@ -15,12 +15,13 @@ from apps.base_site.models import APIToken
 # Get an API token or create a test one if needed
 token = APIToken.objects.filter(is_active=True).first()
 if not token:
-    # Create a test token
-    token = APIToken.objects.create(
-        name="Test Token",
+    # Reuse the test token if an earlier run created it, reactivating it if needed
+    token, _ = APIToken.objects.update_or_create(
         token="test_token_123456",
-        description="Created for API testing"
+        defaults={
+            "name": "Test Token",
+            "description": "Created for API testing",
+            "is_active": True,
+        }
     )
-    print(token.token)
-else:
-    print(token.token) 
\ No newline at end of file
+print(token.token) 
\ No newline at end of file
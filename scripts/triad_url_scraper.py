@@ -28,6 +28,9 @@ visited_urls = set()
 # Set to store product URLs
 product_urls = set()
 
+# Shared session so every page of the crawl reuses the same pooled connection
+session = requests.Session()
+
 def normalize_url(url):
     """
     Normalize a URL by removing fragments (anchors) and query parameters.
@@ -83,7 +86,7 @@ def get_all_links(url):
         logger.debug(f"Attempting to fetch URL: {url}")
         
         try:
-            response = requests.get(url, timeout=30)
+            response = session.get(url, timeout=30)
             logger.debug(f"Received response with status code: {response.status_code}")
         except Exception as req_error:
             logger.error(f"Error during HTTP request: {str(req_error)}")
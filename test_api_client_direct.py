@@ -139,8 +139,8 @@ def verify_equipment_created(slug):
     try:
         # Make a request to the admin API to verify the page exists
         # This is a simple way to check without importing Django models
-        url = f"http://localhost:8080/admin/api/v2beta/pages/?slug={slug}"
-        response = requests.get(url)
+        url = "http://localhost:8080/admin/api/v2beta/pages/"
+        response = requests.get(url, params={"slug": slug})
         
         if response.status_code == 200:
             data = response.json()
@@ -79,10 +79,12 @@ def create_lab_equipment():
     response = requests.post(API_ENDPOINT, headers=headers, data=json.dumps(data))
     
     print(f"Status Code: {response.status_code}")
+    
+    result = response.json()
     print("Response:")
-    print(json.dumps(response.json(), indent=2))
+    print(json.dumps(result, indent=2))
     
-    return response.json()
+    return result
 
 def update_lab_equipment(slug):
     """Update an existing lab equipment page"""
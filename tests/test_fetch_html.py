@@ -0,0 +1,94 @@
+import unittest
+import os
+import sys
+from unittest import mock
+
+# Add the project root to the path so we can import the apps
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apps.ai_processing import utils
+from apps.ai_processing.utils import fetch_html
+
+class FakeStreamingResponse:
+    """Minimal stand-in for a streamed requests.Response."""
+
+    def __init__(self, chunks=(), headers=None, encoding='utf-8', read_body=True):
+        self.chunks = list(chunks)
+        self.headers = headers if headers is not None else {'Content-Type': 'text/html; charset=utf-8'}
+        self.encoding = encoding
+        self.read_body = read_body
+        self.chunks_read = 0
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.closed = True
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        if not self.read_body:
+            raise AssertionError("Body should not be read")
+        for chunk in self.chunks:
+            self.chunks_read += 1
+            yield chunk
+
+class TestFetchHtml(unittest.TestCase):
+
+    def fetch(self, response):
+        with mock.patch.object(utils.requests, 'get', return_value=response) as mock_get:
+            result = fetch_html('http://example.com/page', timeout=5)
+        mock_get.assert_called_once_with('http://example.com/page', headers=None, timeout=5, stream=True)
+        return result
+
+    def test_returns_decoded_html(self):
+        """Test that an HTML response is read and decoded with its encoding."""
+        response = FakeStreamingResponse([b'<html><body>caf', b'\xc3\xa9</body></html>'])
+        self.assertEqual(self.fetch(response), '<html><body>café</body></html>')
+        self.assertTrue(response.closed)
+
+    def test_non_html_content_type_raises(self):
+        """Test that a non-HTML response is rejected without reading the body."""
+        response = FakeStreamingResponse(headers={'Content-Type': 'application/pdf'}, read_body=False)
+        with self.assertRaises(ValueError):
+            self.fetch(response)
+
+    def test_declared_length_over_cap_raises_before_reading(self):
+        """Test that a Content-Length over the cap is rejected before the body is read."""
+        response = FakeStreamingResponse(
+            headers={'Content-Type': 'text/html', 'Content-Length': str(utils.MAX_HTML_BYTES + 1)},
+            read_body=False
+        )
+        with self.assertRaises(ValueError):
+            self.fetch(response)
+
+    def test_streamed_body_over_cap_raises_without_content_length(self):
+        """Test that a body streaming past the cap is rejected when no length is declared."""
+        response = FakeStreamingResponse([b'x' * 6, b'x' * 6, b'x' * 6], headers={'Content-Type': 'text/html'})
+        with mock.patch.object(utils, 'MAX_HTML_BYTES', 10):
+            with self.assertRaises(ValueError):
+                self.fetch(response)
+        # Reading stops as soon as the cap is exceeded
+        self.assertEqual(response.chunks_read, 2)
+
+    def test_streamed_body_over_cap_raises_with_wrong_content_length(self):
+        """Test that an understated Content-Length does not bypass the cap."""
+        response = FakeStreamingResponse(
+            [b'x' * 6, b'x' * 6],
+            headers={'Content-Type': 'text/html', 'Content-Length': '5'}
+        )
+        with mock.patch.object(utils, 'MAX_HTML_BYTES', 10):
+            with self.assertRaises(ValueError):
+                self.fetch(response)
+
+    def test_unknown_charset_falls_back_to_replacement_decoding(self):
+        """Test that an unknown charset is decoded like response.text instead of raising LookupError."""
+        response = FakeStreamingResponse([b'caf\xc3\xa9 \xff'], encoding='x-not-a-charset')
+        self.assertEqual(self.fetch(response), 'café �')
+
+if __name__ == '__main__':
+    unittest.main()
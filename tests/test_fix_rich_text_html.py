@@ -0,0 +1,37 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the path so we can import the apps
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apps.ai_processing.utils import fix_rich_text_html
+
+class TestFixRichTextHtml(unittest.TestCase):
+    
+    def test_empty_content(self):
+        """Test that empty content is returned unchanged."""
+        self.assertEqual(fix_rich_text_html(''), '')
+        self.assertIsNone(fix_rich_text_html(None))
+    
+    def test_plain_text_is_wrapped(self):
+        """Test that content without any <p> tags is wrapped in one paragraph."""
+        self.assertEqual(fix_rich_text_html('Plain text'), '<p>Plain text</p>')
+    
+    def test_br_tags_become_paragraphs(self):
+        """Test that <br> separated content is split into paragraphs."""
+        content = '<p>First<br>Second<br/>Third</p>'
+        self.assertEqual(fix_rich_text_html(content), '<p>First</p><p>Second</p><p>Third</p>')
+    
+    def test_unbalanced_p_tags(self):
+        """Test that unbalanced <p> tags are restructured."""
+        content = '<p>First<p>Second</p>'
+        self.assertEqual(fix_rich_text_html(content), '<p>First</p><p>Second</p>')
+    
+    def test_mixed_content_not_starting_with_p(self):
+        """Test that text before and after paragraphs is wrapped in its own paragraph."""
+        content = 'intro <p>para</p> outro'
+        self.assertEqual(fix_rich_text_html(content), '<p>intro</p><p>para</p><p>outro</p>')
+
+if __name__ == '__main__':
+    unittest.main()
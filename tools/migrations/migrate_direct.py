@@ -21,29 +21,35 @@ import sys
 import sqlite3
 import time
 import argparse
-import subprocess
+import contextlib
+import io
 from pathlib import Path
 
 # Set up base directory
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 sys.path.append(str(BASE_DIR))
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import switch_env
 
 def switch_environment(env_type, platform="ec2"):
     """Switch to the specified environment"""
-    script_path = str(BASE_DIR / "tools" / "migrations" / "switch_env.py")
-    
+    # Call switch_env in-process rather than starting a new interpreter,
+    # keeping its console guidance out of the migration output as before
+    output = io.StringIO()
     try:
-        result = subprocess.run(
-            ["python", script_path, env_type, platform],
-            capture_output=True, 
-            text=True,
-            check=True
-        )
-        print(f"Successfully switched to {env_type} environment on {platform}")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error switching environment: {e.stderr}")
+        with contextlib.redirect_stdout(output):
+            switched = switch_env.switch_environment(env_type, platform)
+    except OSError as e:
+        print(f"Error switching environment: {e}")
+        return False
+    
+    if not switched:
+        print(f"Error switching environment: {output.getvalue().strip()}")
         return False
+    
+    print(f"Successfully switched to {env_type} environment on {platform}")
+    return True
 
 def verify_environment():
     """Make sure we're in production mode with PostgreSQL configured"""
@@ -330,7 +336,7 @@ def migrate_all_tables(sqlite_conn, pg_conn, tables=None, skip_tables=None):
     ordered_tables.extend(list(remaining_tables))
     
     # Start migration
-    start_time = time.time()
+    start_time = time.perf_counter()
     total_records = 0
     migrated_tables = 0
     
@@ -343,7 +349,7 @@ def migrate_all_tables(sqlite_conn, pg_conn, tables=None, skip_tables=None):
         except Exception as e:
             print(f"Error migrating table {table}: {str(e)}")
     
-    elapsed_time = time.time() - start_time
+    elapsed_time = time.perf_counter() - start_time
     print(f"\nMigration completed in {elapsed_time:.2f} seconds")
     print(f"Migrated {total_records} records across {migrated_tables} tables")
     